@@ -15,3 +15,7 @@ DEFAULT_MIN_CONFIDENCE: float = 0.60
 DEFAULT_INPUT_SIZE: Tuple[int, int] = (224, 224)
 IMAGENET_MEAN = [0.485, 0.456, 0.406]
 IMAGENET_STD = [0.229, 0.224, 0.225]
+
+DEFAULT_MIN_INFERENCE_HZ: float = 1.0
+DEFAULT_MAX_INFERENCE_HZ: float = 15.0
+DEFAULT_INFERENCE_CPU_BUDGET: float = 0.5
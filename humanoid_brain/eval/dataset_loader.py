@@ -12,14 +12,28 @@ from torch.utils.data import DataLoader, Dataset
 from torchvision import transforms
 
 from humanoid_brain.config import DEFAULT_INPUT_SIZE, IMAGENET_MEAN, IMAGENET_STD
+from humanoid_brain.models.roi import ROI, crop_pil, draft_jpeg, parse_roi
 
 
 class ClassificationDataset(Dataset):
-    """Image classification dataset from rows with image path + label."""
-
-    def __init__(self, rows: List[Dict[str, str]], images_root: str, transform: Optional[transforms.Compose] = None):
+    """Image classification dataset from rows with image path + label.
+
+    `roi` crops each image (normalized x0, y0, x1, y1) before the resize; `draft`
+    lets JPEGs decode directly at the smallest scale that still covers the input size.
+    """
+
+    def __init__(
+        self,
+        rows: List[Dict[str, str]],
+        images_root: str,
+        transform: Optional[transforms.Compose] = None,
+        roi: Optional[ROI] = None,
+        draft: bool = False,
+    ):
         self.rows = rows
         self.images_root = Path(images_root)
+        self.roi = parse_roi(roi)
+        self.draft = draft
         self.transform = transform or transforms.Compose(
             [
                 transforms.Resize(DEFAULT_INPUT_SIZE),
@@ -36,7 +50,10 @@ class ClassificationDataset(Dataset):
         image_rel = row["image"]
         label = row["label"]
         image_path = (self.images_root / image_rel).resolve()
-        image = Image.open(image_path).convert("RGB")
+        image = Image.open(image_path)
+        if self.draft:
+            image = draft_jpeg(image, DEFAULT_INPUT_SIZE, self.roi, in_place=True)
+        image = crop_pil(image, self.roi).convert("RGB")
         x = self.transform(image)
         return x, label
 
@@ -59,14 +76,20 @@ def _load_csv(dataset_csv: str) -> List[Dict[str, str]]:
     return rows
 
 
-def load_dataset(dataset_jsonl: Optional[str] = None, dataset_csv: Optional[str] = None, images_root: str = ".") -> ClassificationDataset:
+def load_dataset(
+    dataset_jsonl: Optional[str] = None,
+    dataset_csv: Optional[str] = None,
+    images_root: str = ".",
+    roi: Optional[ROI] = None,
+    draft: bool = False,
+) -> ClassificationDataset:
     """Load JSONL or CSV classification dataset."""
     if not dataset_jsonl and not dataset_csv:
         raise ValueError("Provide dataset_jsonl or dataset_csv")
     rows = _load_jsonl(dataset_jsonl) if dataset_jsonl else _load_csv(dataset_csv)  # type: ignore[arg-type]
     if not rows:
         raise RuntimeError("Dataset is empty.")
-    return ClassificationDataset(rows=rows, images_root=images_root)
+    return ClassificationDataset(rows=rows, images_root=images_root, roi=roi, draft=draft)
 
 
 def create_dataloader(dataset: ClassificationDataset, batch_size: int = 16, num_workers: int = 0) -> DataLoader:
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import math
+import random
+import time
 from collections import Counter, defaultdict
-from typing import Dict, List
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
 
 import torch
 
 from humanoid_brain.eval.dataset_loader import collect_class_names, create_dataloader, load_dataset
+from humanoid_brain.models.roi import ROI, parse_roi
 from humanoid_brain.models.task_classifier import TaskClassifier
+from humanoid_brain.telemetry.profiler import profile_inference
 
 
 def _format_confusion_matrix(classes: List[str], matrix: Dict[str, Dict[str, int]]) -> str:
@@ -21,29 +28,29 @@ def _format_confusion_matrix(classes: List[str], matrix: Dict[str, Dict[str, int
     return "\n".join(lines)
 
 
-def run_eval(weights: str, dataset_jsonl: str, images_root: str, batch_size: int, device: str) -> None:
-    dataset = load_dataset(dataset_jsonl=dataset_jsonl, images_root=images_root)
-    dataloader = create_dataloader(dataset, batch_size=batch_size, num_workers=0)
-    classes = collect_class_names(dataset)
-    classifier = TaskClassifier(weights_path=weights, device=device)
+def _predict_label(classifier: TaskClassifier, image_tensor: torch.Tensor) -> str:
+    image = image_tensor.permute(1, 2, 0).cpu().numpy()
+    pred = classifier.predict(image)
+    y_pred = pred["label"]
+    if y_pred == "unknown":
+        probs = pred["probs"]
+        y_pred = max(probs, key=probs.get)
+    return y_pred
 
+
+def _evaluate(classifier: TaskClassifier, dataloader) -> Dict[str, Any]:
     total = 0
     correct = 0
     per_task_total = Counter()
     per_task_correct = Counter()
     confusion = defaultdict(lambda: defaultdict(int))
 
+    start = time.perf_counter()
     for x_batch, labels in dataloader:
         # Evaluate sample-wise because SDK predict() accepts one image at a time.
         for i in range(x_batch.shape[0]):
-            image_tensor = x_batch[i]
-            image = image_tensor.permute(1, 2, 0).cpu().numpy()
-            pred = classifier.predict(image)
             y_true = labels[i]
-            y_pred = pred["label"]
-            if y_pred == "unknown":
-                probs = pred["probs"]
-                y_pred = max(probs, key=probs.get)
+            y_pred = _predict_label(classifier, x_batch[i])
 
             total += 1
             per_task_total[y_true] += 1
@@ -52,17 +59,191 @@ def run_eval(weights: str, dataset_jsonl: str, images_root: str, batch_size: int
                 correct += 1
                 per_task_correct[y_true] += 1
 
-    overall_acc = (correct / total * 100.0) if total else 0.0
+    return {
+        "total": total,
+        "correct": correct,
+        "per_task_total": per_task_total,
+        "per_task_correct": per_task_correct,
+        "confusion": confusion,
+        "elapsed_s": time.perf_counter() - start,
+    }
+
+
+def _accuracy(correct: int, total: int) -> float:
+    return (correct / total * 100.0) if total else 0.0
+
+
+def _print_decode_comparison(classes: List[str], baseline: Dict[str, Any], reduced: Dict[str, Any]) -> None:
+    base_acc = _accuracy(baseline["correct"], baseline["total"])
+    reduced_acc = _accuracy(reduced["correct"], reduced["total"])
+    print("\nROI/reduced-decode impact (full decode -> ROI/draft):")
+    print(f"  {'overall':12s} {base_acc:6.2f}% -> {reduced_acc:6.2f}% ({reduced_acc - base_acc:+.2f} pts)")
+    for cls in classes:
+        b = _accuracy(baseline["per_task_correct"][cls], baseline["per_task_total"][cls])
+        r = _accuracy(reduced["per_task_correct"][cls], reduced["per_task_total"][cls])
+        print(f"  {cls:12s} {b:6.2f}% -> {r:6.2f}% ({r - b:+.2f} pts)")
+    print(f"  {'wall time':12s} {baseline['elapsed_s']:.2f}s -> {reduced['elapsed_s']:.2f}s")
+
+
+def run_eval(
+    weights: str,
+    dataset_jsonl: str,
+    images_root: str,
+    batch_size: int,
+    device: str,
+    profile_dir: Optional[str] = None,
+    profile_frames: int = 50,
+    roi: Optional[ROI] = None,
+    draft: bool = False,
+    compare_decode: bool = False,
+) -> None:
+    dataset = load_dataset(dataset_jsonl=dataset_jsonl, images_root=images_root, roi=roi, draft=draft)
+    dataloader = create_dataloader(dataset, batch_size=batch_size, num_workers=0)
+    classes = collect_class_names(dataset)
+    classifier = TaskClassifier(weights_path=weights, device=device)
+
+    profiling = profile_inference(profile_dir, max_frames=profile_frames) if profile_dir else contextlib.nullcontext()
+    with profiling:
+        result = _evaluate(classifier, dataloader)
+
+    total = result["total"]
+    correct = result["correct"]
+    per_task_total = result["per_task_total"]
+    per_task_correct = result["per_task_correct"]
+
+    overall_acc = _accuracy(correct, total)
     print(f"Overall accuracy: {overall_acc:.2f}% ({correct}/{total})")
     print("Per-task accuracy:")
     for cls in classes:
         t = per_task_total[cls]
         c = per_task_correct[cls]
-        acc = (c / t * 100.0) if t else 0.0
+        acc = _accuracy(c, t)
         print(f"  {cls:12s} {acc:6.2f}% ({c}/{t})")
 
     print("\nConfusion matrix (CSV format):")
-    print(_format_confusion_matrix(classes, confusion))
+    print(_format_confusion_matrix(classes, result["confusion"]))
+
+    if compare_decode and (roi is not None or draft):
+        baseline_dataset = load_dataset(dataset_jsonl=dataset_jsonl, images_root=images_root)
+        baseline = _evaluate(classifier, create_dataloader(baseline_dataset, batch_size=batch_size, num_workers=0))
+        _print_decode_comparison(classes, baseline, result)
+
+
+def _wilson_interval(correct: int, total: int, z: float) -> Tuple[float, float]:
+    if total == 0:
+        return 0.0, 1.0
+    p = correct / total
+    denom = 1.0 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    half = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _stratified_interval(
+    correct: Dict[str, int], total: Dict[str, int], population: Dict[str, int], z: float
+) -> Tuple[float, float, float]:
+    """Overall accuracy and interval from stratified samples.
+
+    Uses Agresti-Coull adjusted per-task proportions (so all-correct or all-wrong
+    tasks still carry variance) with a finite-population correction, since
+    samples are drawn without replacement from each task's pool.
+    """
+    grand_total = sum(population.values())
+    estimate = 0.0
+    variance = 0.0
+    for cls, size in population.items():
+        n, c = total[cls], correct[cls]
+        weight = size / grand_total
+        n_adj = n + z * z
+        p_adj = (c + z * z / 2.0) / n_adj
+        fpc = (size - n) / (size - 1) if size > 1 else 0.0
+        estimate += weight * (c / n if n else p_adj)
+        variance += weight * weight * p_adj * (1 - p_adj) / n_adj * fpc
+    half = z * math.sqrt(variance)
+    return estimate, max(0.0, estimate - half), min(1.0, estimate + half)
+
+
+def run_sampled_eval(
+    weights: str,
+    dataset_jsonl: str,
+    images_root: str,
+    device: str,
+    ci_width: float = 0.10,
+    confidence: float = 0.95,
+    time_budget_s: Optional[float] = None,
+    min_per_task: int = 10,
+    seed: int = 0,
+    roi: Optional[ROI] = None,
+    draft: bool = False,
+) -> None:
+    """
+    Estimate accuracy from stratified random samples, stopping early.
+
+    Each step evaluates one more sample from the task whose Wilson interval is
+    widest. Sampling stops once every per-task interval is at most `ci_width`
+    wide, every task is exhausted, or `time_budget_s` runs out. Overall accuracy
+    is the manifest-weighted combination of the per-task estimates, with a
+    stratified interval at the same confidence level.
+    """
+    dataset = load_dataset(dataset_jsonl=dataset_jsonl, images_root=images_root, roi=roi, draft=draft)
+    classes = collect_class_names(dataset)
+    classifier = TaskClassifier(weights_path=weights, device=device)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+    rng = random.Random(seed)
+    pools: Dict[str, List[int]] = defaultdict(list)
+    for idx, row in enumerate(dataset.rows):
+        pools[row["label"]].append(idx)
+    for indices in pools.values():
+        rng.shuffle(indices)
+
+    per_task_total = Counter()
+    per_task_correct = Counter()
+
+    def width(cls: str) -> float:
+        lo, hi = _wilson_interval(per_task_correct[cls], per_task_total[cls], z)
+        return hi - lo
+
+    start = time.perf_counter()
+    stop_reason = "all tasks exhausted"
+    while True:
+        candidates = [cls for cls in classes if per_task_total[cls] < len(pools[cls])]
+        if not candidates:
+            break
+        open_tasks = [cls for cls in candidates if per_task_total[cls] < min_per_task or width(cls) > ci_width]
+        if not open_tasks:
+            converged = all(width(cls) <= ci_width for cls in classes)
+            stop_reason = "target interval width reached" if converged else "unconverged tasks exhausted"
+            break
+        if time_budget_s is not None and time.perf_counter() - start >= time_budget_s:
+            stop_reason = "time budget exhausted"
+            break
+        # Exhausted tasks keep their final interval; sample the widest remaining one.
+        cls = max(open_tasks, key=lambda c: (per_task_total[c] < min_per_task, width(c)))
+        image_tensor, y_true = dataset[pools[cls][per_task_total[cls]]]
+        y_pred = _predict_label(classifier, image_tensor)
+        per_task_total[y_true] += 1
+        if y_true == y_pred:
+            per_task_correct[y_true] += 1
+
+    elapsed = time.perf_counter() - start
+    used = sum(per_task_total.values())
+    intervals = {cls: _wilson_interval(per_task_correct[cls], per_task_total[cls], z) for cls in classes}
+    overall, overall_lo, overall_hi = _stratified_interval(
+        per_task_correct, per_task_total, {cls: len(pools[cls]) for cls in classes}, z
+    )
+
+    print(f"Sampled evaluation: {used}/{len(dataset)} samples in {elapsed:.1f}s ({stop_reason})")
+    print(
+        f"Overall accuracy: {overall * 100.0:.2f}% "
+        f"[{overall_lo * 100.0:.2f}%, {overall_hi * 100.0:.2f}%] at {confidence:.0%} confidence (stratified)"
+    )
+    print(f"Per-task accuracy (Wilson intervals, target width {ci_width * 100.0:.1f} pts):")
+    for cls in classes:
+        t = per_task_total[cls]
+        c = per_task_correct[cls]
+        lo, hi = intervals[cls]
+        print(f"  {cls:12s} {_accuracy(c, t):6.2f}% [{lo * 100.0:6.2f}%, {hi * 100.0:6.2f}%] width {(hi - lo) * 100.0:5.2f} ({c}/{t} of {len(pools[cls])})")
 
 
 def main() -> None:
@@ -70,19 +251,64 @@ def main() -> None:
     parser.add_argument("--weights", required=True, type=str)
     parser.add_argument("--dataset-jsonl", required=True, type=str)
     parser.add_argument("--images-root", required=True, type=str)
-    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=None, help="Dataloader batch size (default 16).")
     parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--profile-dir", type=str, default=None, help="Write a torch.profiler trace of the first frames here.")
+    parser.add_argument("--profile-frames", type=int, default=50)
+    parser.add_argument("--roi", type=str, default=None, help="Normalized crop box x0,y0,x1,y1 applied before resize.")
+    parser.add_argument("--draft", action="store_true", help="Decode JPEGs at reduced scale (PIL draft mode).")
+    parser.add_argument(
+        "--compare-decode", action="store_true", help="Also run a full-decode pass and report the accuracy impact."
+    )
+    parser.add_argument("--sample", action="store_true", help="Stratified sampling eval with early stopping.")
+    parser.add_argument("--ci-width", type=float, default=0.10, help="Target per-task interval width (fraction).")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--time-budget-s", type=float, default=None)
+    parser.add_argument("--min-per-task", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
     args = parser.parse_args()
 
     if args.device.startswith("cuda") and not torch.cuda.is_available():
         raise RuntimeError("CUDA requested but not available.")
 
+    if args.sample:
+        unsupported = [
+            flag
+            for flag, value in (
+                ("--profile-dir", args.profile_dir),
+                ("--compare-decode", args.compare_decode),
+                ("--batch-size", args.batch_size),
+            )
+            if value
+        ]
+        if unsupported:
+            parser.error(f"--sample does not support {', '.join(unsupported)}")
+        run_sampled_eval(
+            weights=args.weights,
+            dataset_jsonl=args.dataset_jsonl,
+            images_root=args.images_root,
+            device=args.device,
+            ci_width=args.ci_width,
+            confidence=args.confidence,
+            time_budget_s=args.time_budget_s,
+            min_per_task=args.min_per_task,
+            seed=args.seed,
+            roi=parse_roi(args.roi),
+            draft=args.draft,
+        )
+        return
+
     run_eval(
         weights=args.weights,
         dataset_jsonl=args.dataset_jsonl,
         images_root=args.images_root,
-        batch_size=args.batch_size,
+        batch_size=args.batch_size or 16,
         device=args.device,
+        profile_dir=args.profile_dir,
+        profile_frames=args.profile_frames,
+        roi=parse_roi(args.roi),
+        draft=args.draft,
+        compare_decode=args.compare_decode,
     )
 
 
@@ -1,12 +1,16 @@
 """Demo script for non-ROS SDK inference."""
 
 import argparse
+import contextlib
 import json
 
 from PIL import Image
 
+from humanoid_brain.models.roi import parse_roi
 from humanoid_brain.sdk.inference_api import load_brain
+from humanoid_brain.telemetry.aggregator import WindowedTelemetryLogger
 from humanoid_brain.telemetry.logger import TelemetryLogger
+from humanoid_brain.telemetry.profiler import profile_inference
 
 
 def main() -> None:
@@ -14,21 +18,43 @@ def main() -> None:
     parser.add_argument("--weights", type=str, default="best_licensed_balanced.pt")
     parser.add_argument("--image", type=str, required=True)
     parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--mmap-weights", action="store_true", help="Memory-map weights exported by shared_weights.")
     parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--roi", type=str, default=None, help="Normalized crop box x0,y0,x1,y1 applied before resize.")
+    parser.add_argument("--draft", action="store_true", help="Decode JPEGs at reduced scale (PIL draft mode).")
     parser.add_argument("--telemetry-jsonl", type=str, default=None)
+    parser.add_argument("--telemetry-window-s", type=float, default=None, help="Aggregate telemetry into windows of this length.")
+    parser.add_argument("--telemetry-sample-every", type=int, default=100, help="Keep 1 in N raw events when aggregating.")
+    parser.add_argument("--profile-dir", type=str, default=None, help="Write a torch.profiler trace of the decision here.")
+    parser.add_argument("--profile-frames", type=int, default=1)
     args = parser.parse_args()
 
-    telemetry = TelemetryLogger(jsonl_path=args.telemetry_jsonl, to_stdout=True)
+    if args.telemetry_window_s:
+        telemetry = WindowedTelemetryLogger(
+            jsonl_path=args.telemetry_jsonl,
+            to_stdout=True,
+            window_s=args.telemetry_window_s,
+            sample_every_n=args.telemetry_sample_every,
+        )
+    else:
+        telemetry = TelemetryLogger(jsonl_path=args.telemetry_jsonl, to_stdout=True)
     brain = load_brain(
         weights_path=args.weights,
         device=args.device,
         min_confidence=args.min_confidence,
         telemetry_logger=telemetry,
+        mmap_weights=args.mmap_weights,
+        roi=parse_roi(args.roi),
+        draft=args.draft,
     )
 
-    image = Image.open(args.image).convert("RGB")
-    decision = brain.decide(image=image, robot_state={}, env_state={})
+    # Left unloaded so the SDK can decode JPEGs directly at reduced scale with --draft.
+    image = Image.open(args.image)
+    profiling = profile_inference(args.profile_dir, max_frames=args.profile_frames) if args.profile_dir else contextlib.nullcontext()
+    with profiling:
+        decision = brain.decide(image=image, robot_state={}, env_state={})
     print(json.dumps(decision, indent=2))
+    telemetry.close()
 
 
 if __name__ == "__main__":
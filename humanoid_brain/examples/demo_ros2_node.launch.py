@@ -25,6 +25,12 @@ def generate_launch_description() -> LaunchDescription:
                     {
                         "weights_path": "best_licensed_balanced.pt",
                         "device": "cpu",
+                        "adaptive_rate": True,
+                        "min_rate_hz": 1.0,
+                        "max_rate_hz": 15.0,
+                        "cpu_budget": 0.5,
+                        # Normalized crop box x0,y0,x1,y1; "" uses the full frame.
+                        "roi": "",
                     }
                 ],
             )
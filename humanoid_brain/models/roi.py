@@ -0,0 +1,84 @@
+"""Region-of-interest cropping and reduced-resolution JPEG decode.
+
+ROIs are `(x0, y0, x1, y1)` boxes in normalized [0, 1] image coordinates, so the
+same box applies to 720p, 1080p and 4K frames and to JPEGs decoded at reduced
+scale. Cropping happens before any resize so the discarded pixels are never
+resampled.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+ROI = Tuple[float, float, float, float]
+
+
+def parse_roi(value: Optional[Any]) -> Optional[ROI]:
+    """Validate an ROI given as a sequence or a "x0,y0,x1,y1" string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = [float(part) for part in value.split(",")]
+    if not isinstance(value, Sequence) or len(value) != 4:
+        raise ValueError("roi must be (x0, y0, x1, y1)")
+    x0, y0, x1, y1 = (float(v) for v in value)
+    if not (0.0 <= x0 < x1 <= 1.0 and 0.0 <= y0 < y1 <= 1.0):
+        raise ValueError("roi must satisfy 0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1")
+    return (x0, y0, x1, y1)
+
+
+def roi_from_state(*states: Optional[Mapping[str, Any]]) -> Optional[ROI]:
+    """Return the first `roi` entry found in the given robot/env state dicts."""
+    for state in states:
+        if state and state.get("roi") is not None:
+            return parse_roi(state["roi"])
+    return None
+
+
+def _pixel_box(width: int, height: int, roi: ROI) -> Tuple[int, int, int, int]:
+    x0, y0, x1, y1 = roi
+    left, top = int(x0 * width), int(y0 * height)
+    right, bottom = max(left + 1, int(round(x1 * width))), max(top + 1, int(round(y1 * height)))
+    return left, top, right, bottom
+
+
+def crop_array(image: np.ndarray, roi: Optional[ROI]) -> np.ndarray:
+    """Crop an HWC array to the ROI; returns a view, no pixels are copied."""
+    if roi is None:
+        return image
+    left, top, right, bottom = _pixel_box(image.shape[1], image.shape[0], roi)
+    return image[top:bottom, left:right]
+
+
+def crop_pil(image: Image.Image, roi: Optional[ROI]) -> Image.Image:
+    """Crop a PIL image to the ROI."""
+    if roi is None:
+        return image
+    return image.crop(_pixel_box(image.width, image.height, roi))
+
+
+def draft_jpeg(
+    image: Image.Image, target_size: Tuple[int, int], roi: Optional[ROI] = None, in_place: bool = False
+) -> Image.Image:
+    """Ask libjpeg to decode at the smallest DCT scale that still covers the target.
+
+    Only affects JPEGs that have not been loaded yet; the ROI is taken into account
+    so the cropped region still ends up at least `target_size` pixels. Unless
+    `in_place` is set, the caller's image is left untouched: a file-backed image is
+    reopened and the new handle is drafted, anything else is returned as-is.
+    """
+    if image.format != "JPEG" or not getattr(image, "tile", None):
+        return image
+    if not in_place:
+        filename = getattr(image, "filename", "")
+        if not filename:
+            return image
+        image = Image.open(filename)
+    x0, y0, x1, y1 = roi or (0.0, 0.0, 1.0, 1.0)
+    target_h, target_w = target_size
+    requested = (int(np.ceil(target_w / (x1 - x0))), int(np.ceil(target_h / (y1 - y0))))
+    image.draft("RGB", requested)
+    return image
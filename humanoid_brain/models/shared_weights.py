@@ -0,0 +1,137 @@
+"""Memory-mapped, read-only weights shared across processes on one robot.
+
+Several processes on a robot (perception, logging, the ROS node) each build a
+`TaskClassifier`. With a plain `torch.load` every process holds a private copy of
+the weights. Loading a flat export with `torch.load(mmap=True)` and assigning the
+mapped tensors straight into a model built on the meta device
+(`load_state_dict(assign=True)`) keeps the parameters backed by the page cache, so
+all processes share the same physical pages and none allocates a private copy.
+
+Requires torch >= 2.1. Usage:
+
+    python -m humanoid_brain.models.shared_weights export --src best.pt --dst best.shared.pt
+    python -m humanoid_brain.models.shared_weights measure --weights best.shared.pt --processes 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+from typing import Any, Dict, List
+
+import torch
+
+from humanoid_brain.config import TASK_LABELS
+
+
+def export_shared_weights(src_path: str, dst_path: str) -> None:
+    """Rewrite a training checkpoint as a flat, mmap-friendly inference file.
+
+    Only class names and a contiguous CPU state dict are kept; optimizer state and
+    other training artefacts are dropped so the mapped file is as small as possible.
+    """
+    checkpoint = torch.load(src_path, map_location="cpu")
+    state_dict = checkpoint.get("model_state_dict", checkpoint)
+    flat = {name: tensor.detach().cpu().contiguous().clone() for name, tensor in state_dict.items()}
+    torch.save({"classes": list(checkpoint.get("classes", TASK_LABELS)), "model_state_dict": flat}, dst_path)
+
+
+def load_checkpoint(weights_path: str, device: torch.device, mmap: bool = False) -> Dict[str, Any]:
+    """Load a checkpoint, memory-mapping it read-only when `mmap` is set.
+
+    Memory mapping only shares pages on CPU; for other devices the tensors are
+    copied anyway, so the regular loader is used.
+    """
+    if mmap and device.type == "cpu":
+        return torch.load(weights_path, map_location="cpu", mmap=True, weights_only=True)
+    return torch.load(weights_path, map_location=device)
+
+
+def memory_usage_bytes() -> Dict[str, int]:
+    """Return RSS and PSS of the current process (Linux only, 0 when unavailable).
+
+    PSS divides shared pages between the processes mapping them, so summing it
+    across processes gives the real footprint of the fleet of processes.
+    """
+    usage = {"rss": 0, "pss": 0}
+    try:
+        with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    usage[key.lower()] = int(rest.split()[0]) * 1024
+    except OSError:
+        pass
+    return usage
+
+
+def _measure_child(weights_path: str, mmap: bool, ready, release, results) -> None:
+    from humanoid_brain.models.task_classifier import TaskClassifier
+
+    baseline = memory_usage_bytes()
+    classifier = TaskClassifier(weights_path=weights_path, mmap_weights=mmap)
+    # Touch every parameter so mapped pages are actually resident.
+    with torch.no_grad():
+        for param in classifier.model.parameters():
+            param.sum()
+    ready.wait()
+    loaded = memory_usage_bytes()
+    results.put({"rss_delta": loaded["rss"] - baseline["rss"], "pss_delta": loaded["pss"] - baseline["pss"]})
+    release.wait()
+
+
+def measure_sharing(weights_path: str, processes: int = 3) -> Dict[str, Dict[str, int]]:
+    """Load the classifier in `processes` concurrent processes, with and without mmap.
+
+    Returns the summed RSS and PSS growth attributable to loading the model.
+    """
+    ctx = mp.get_context("spawn")
+    report: Dict[str, Dict[str, int]] = {}
+    for mode, use_mmap in (("private", False), ("mmap", True)):
+        ready = ctx.Barrier(processes + 1)
+        release = ctx.Event()
+        results = ctx.Queue()
+        workers: List[Any] = [
+            ctx.Process(target=_measure_child, args=(weights_path, use_mmap, ready, release, results))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        # All children hold their model at the same time when they sample memory.
+        ready.wait()
+        samples = [results.get() for _ in workers]
+        release.set()
+        for worker in workers:
+            worker.join()
+        report[mode] = {
+            "rss_total": sum(s["rss_delta"] for s in samples),
+            "pss_total": sum(s["pss_delta"] for s in samples),
+        }
+    report["savings"] = {
+        "pss_bytes": report["private"]["pss_total"] - report["mmap"]["pss_total"],
+        "rss_bytes": report["private"]["rss_total"] - report["mmap"]["rss_total"],
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export and measure shared memory-mapped weights.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Convert a training checkpoint to the shared format.")
+    export.add_argument("--src", required=True, type=str)
+    export.add_argument("--dst", required=True, type=str)
+    measure = sub.add_parser("measure", help="Report memory savings across concurrent processes.")
+    measure.add_argument("--weights", required=True, type=str)
+    measure.add_argument("--processes", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_shared_weights(args.src, args.dst)
+        print(f"Wrote shared weights to {args.dst}")
+    else:
+        print(json.dumps(measure_sharing(args.weights, processes=args.processes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
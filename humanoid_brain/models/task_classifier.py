@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional, Union
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 import numpy as np
 import torch
@@ -17,11 +20,16 @@ from humanoid_brain.config import (
     IMAGENET_STD,
     TASK_LABELS,
 )
+from humanoid_brain.models.roi import ROI, crop_array, crop_pil, draft_jpeg, parse_roi
+from humanoid_brain.models.shared_weights import load_checkpoint
 from humanoid_brain.telemetry.events import ErrorEvent, TaskDecisionEvent
 from humanoid_brain.telemetry.logger import TelemetryLogger
+from humanoid_brain.telemetry.profiler import profile_frame, profile_stage
 
 
 ImageLike = Union[np.ndarray, Image.Image]
+_STREAM_END = object()
+_FEEDER_JOIN_TIMEOUT_S = 1.0
 
 
 class TaskClassifier:
@@ -33,16 +41,28 @@ class TaskClassifier:
         device: str = DEFAULT_DEVICE,
         min_confidence: float = DEFAULT_MIN_CONFIDENCE,
         telemetry_logger: Optional[TelemetryLogger] = None,
+        mmap_weights: bool = False,
+        roi: Optional[ROI] = None,
+        draft: bool = False,
     ):
         self.device = torch.device(device)
         self.min_confidence = min_confidence
         self.telemetry = telemetry_logger
+        self.roi = parse_roi(roi)
+        self.draft = draft
 
-        checkpoint = torch.load(weights_path, map_location=self.device)
+        checkpoint = load_checkpoint(weights_path, self.device, mmap=mmap_weights)
         self.class_names = checkpoint.get("classes", TASK_LABELS)
-        self.model = self._build_model(num_classes=len(self.class_names))
+        if mmap_weights:
+            # Build without storage so no private, randomly initialised copy of the
+            # weights is allocated before the mapped tensors are assigned.
+            with torch.device("meta"):
+                self.model = self._build_model(num_classes=len(self.class_names))
+        else:
+            self.model = self._build_model(num_classes=len(self.class_names))
         state_dict = checkpoint.get("model_state_dict", checkpoint)
-        self.model.load_state_dict(state_dict)
+        # assign=True keeps parameters backed by the mapped file instead of copying them.
+        self.model.load_state_dict(state_dict, assign=mmap_weights)
         self.model.to(self.device)
         self.model.eval()
 
@@ -61,12 +81,15 @@ class TaskClassifier:
         model.classifier[-1] = torch.nn.Linear(in_features, num_classes)
         return model
 
-    @staticmethod
-    def _to_pil(image: ImageLike) -> Image.Image:
+    def _to_pil(self, image: ImageLike, roi: Optional[ROI] = None) -> Image.Image:
         if isinstance(image, Image.Image):
-            return image.convert("RGB")
+            if self.draft:
+                # Unloaded JPEGs decode straight at a reduced DCT scale; the caller's image is not modified.
+                image = draft_jpeg(image, DEFAULT_INPUT_SIZE, roi)
+            return crop_pil(image, roi).convert("RGB")
         if not isinstance(image, np.ndarray):
             raise TypeError("image must be numpy array or PIL.Image")
+        image = crop_array(image, roi)
         if image.dtype != np.uint8:
             clipped = np.clip(image, 0.0, 1.0) if image.max() <= 1.0 else np.clip(image, 0.0, 255.0)
             image = (clipped * 255.0).astype(np.uint8) if clipped.max() <= 1.0 else clipped.astype(np.uint8)
@@ -76,10 +99,32 @@ class TaskClassifier:
             image = image[:, :, :3]
         return Image.fromarray(image).convert("RGB")
 
-    def predict(self, image: ImageLike) -> Dict[str, object]:
+    def preprocess(self, image: ImageLike, roi: Optional[ROI] = None) -> torch.Tensor:
+        """Convert one image to a normalized CHW tensor on CPU.
+
+        `roi` overrides the classifier's fixed ROI for this frame. Safe to call from
+        worker threads; used by batch pipelines to overlap decode and resize with the
+        forward pass.
+        """
+        return self.transform(self._to_pil(image, roi=parse_roi(roi) or self.roi))
+
+    def _decode_probs(self, probs_row: torch.Tensor) -> Dict[str, object]:
+        probs = {name: float(probs_row[idx]) for idx, name in enumerate(self.class_names)}
+        label = max(probs, key=probs.get)
+        confidence = probs[label]
+        if confidence < self.min_confidence:
+            label = "unknown"
+
+        if self.telemetry:
+            self.telemetry.log_event(TaskDecisionEvent(label=label, probs=probs, confidence=confidence))
+        return {"label": label, "probs": probs}
+
+    def predict(self, image: ImageLike, roi: Optional[ROI] = None) -> Dict[str, object]:
         """
         Predict task label and class probabilities.
 
+        `roi` is an optional normalized (x0, y0, x1, y1) crop applied before resizing.
+
         Returns:
           {
             "label": str,            # one of known classes or "unknown"
@@ -87,23 +132,134 @@ class TaskClassifier:
           }
         """
         try:
-            pil = self._to_pil(image)
-            x = self.transform(pil).unsqueeze(0).to(self.device)
-            with torch.no_grad():
-                logits = self.model(x)
-                probs_tensor = torch.softmax(logits, dim=1)[0].cpu()
-            probs = {name: float(probs_tensor[idx]) for idx, name in enumerate(self.class_names)}
-            label = max(probs, key=probs.get)
-            confidence = probs[label]
-            if confidence < self.min_confidence:
-                label = "unknown"
-
-            if self.telemetry:
-                self.telemetry.log_event(TaskDecisionEvent(label=label, probs=probs, confidence=confidence))
-            return {"label": label, "probs": probs}
+            with profile_frame("predict"):
+                with profile_stage("preprocess"):
+                    x = self.preprocess(image, roi=roi).unsqueeze(0).to(self.device)
+                with profile_stage("forward"), torch.no_grad():
+                    logits = self.model(x)
+                    probs_tensor = torch.softmax(logits, dim=1)[0].cpu()
+                return self._decode_probs(probs_tensor)
         except Exception as exc:
             if self.telemetry:
                 self.telemetry.log_event(
                     ErrorEvent(source="TaskClassifier.predict", message=str(exc), details={"type": type(exc).__name__})
                 )
             raise
+
+    def predict_batch(self, images: Union[Sequence[ImageLike], torch.Tensor], roi: Optional[ROI] = None) -> List[Dict[str, object]]:
+        """
+        Predict a batch of images in one forward pass.
+
+        `images` is either a sequence of images or an NCHW tensor already produced by
+        `preprocess` (in which case `roi` is ignored). Returns one `predict`-shaped
+        dict per input, in input order.
+        """
+        try:
+            with profile_frame("predict_batch"):
+                with profile_stage("preprocess"):
+                    if isinstance(images, torch.Tensor):
+                        x = images
+                    else:
+                        if len(images) == 0:
+                            return []
+                        x = torch.stack([self.preprocess(image, roi=roi) for image in images])
+                    x = x.to(self.device)
+                with profile_stage("forward"), torch.no_grad():
+                    logits = self.model(x)
+                    probs_tensor = torch.softmax(logits, dim=1).cpu()
+                return [self._decode_probs(row) for row in probs_tensor]
+        except Exception as exc:
+            if self.telemetry:
+                self.telemetry.log_event(
+                    ErrorEvent(source="TaskClassifier.predict_batch", message=str(exc), details={"type": type(exc).__name__})
+                )
+            raise
+
+    def predict_stream(
+        self,
+        frames: Iterable[ImageLike],
+        roi: Optional[ROI] = None,
+        max_in_flight: int = 2,
+        workers: int = 1,
+    ) -> Iterator[Dict[str, object]]:
+        """
+        Pipelined single-frame prediction over a stream of frames.
+
+        A feeder thread pulls frames from `frames` and hands them to `workers`
+        preprocessing threads, while the caller's thread runs the forward pass. The
+        caller never blocks on the source while a preprocessed frame is ready, so a
+        live camera generator adds no latency. At most `max_in_flight` frames are
+        pulled from the source ahead of the one being inferred. Results are
+        `predict`-shaped dicts yielded one per frame, in input order, without
+        batching. Closing the generator stops the feeder before it pulls another
+        frame and waits briefly for it to leave the source.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        pending: "queue.Queue[object]" = queue.Queue()
+        slots = threading.Semaphore(max_in_flight)
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classifier-preprocess")
+        source = iter(frames)
+
+        def preprocess(image: ImageLike) -> torch.Tensor:
+            with profile_stage("preprocess"):
+                return self.preprocess(image, roi=roi)
+
+        def feed() -> None:
+            try:
+                while True:
+                    slots.acquire()
+                    if stop.is_set():
+                        return
+                    try:
+                        image = next(source)
+                    except StopIteration:
+                        return
+                    pending.put(pool.submit(preprocess, image))
+            except Exception as exc:
+                pending.put(exc)
+            finally:
+                pending.put(_STREAM_END)
+
+        feeder = threading.Thread(target=feed, name="classifier-feeder", daemon=True)
+        feeder.start()
+        try:
+            while True:
+                entry = pending.get()
+                if entry is _STREAM_END:
+                    return
+                slots.release()
+                try:
+                    if isinstance(entry, Exception):
+                        raise entry
+                    with profile_frame("predict_stream"):
+                        x = entry.result().unsqueeze(0).to(self.device)
+                        with profile_stage("forward"), torch.no_grad():
+                            logits = self.model(x)
+                            probs_tensor = torch.softmax(logits, dim=1)[0].cpu()
+                        result = self._decode_probs(probs_tensor)
+                except Exception as exc:
+                    if self.telemetry:
+                        self.telemetry.log_event(
+                            ErrorEvent(
+                                source="TaskClassifier.predict_stream", message=str(exc), details={"type": type(exc).__name__}
+                            )
+                        )
+                    raise
+                yield result
+        finally:
+            stop.set()
+            # Wake a feeder waiting for a slot so it sees `stop`, then give it time to
+            # return from the source before the caller releases it. A source blocked
+            # for longer is left to the daemon feeder.
+            slots.release(max_in_flight)
+            feeder.join(timeout=_FEEDER_JOIN_TIMEOUT_S)
+            while True:
+                try:
+                    entry = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(entry, Future):
+                    entry.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
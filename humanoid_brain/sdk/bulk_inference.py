@@ -0,0 +1,400 @@
+"""Bulk offline inference CLI for relabelling and audits.
+
+Inputs are streamed from image directories, manifests (JSONL/CSV/plain text lists)
+or video files. A decode thread pool feeds a bounded prefetch queue which the main
+thread drains into batched `HumanoidBrain.decide_batch` calls; results are written
+to sharded JSONL or Parquet. Memory stays bounded by `prefetch + batch_size` frames
+plus one output shard, independent of input size.
+
+Inputs that cannot be read (missing files, unopenable videos, malformed manifest
+lines) become error rows rather than aborting the run.
+
+Video frames are decoded sequentially on the producer thread, since a video stream
+can only be decoded in order; colour conversion, resize and normalization run in
+the pool. For video-heavy workloads, shard the videos across several invocations.
+
+Video input requires OpenCV (`cv2`); Parquet output requires `pyarrow`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import torch
+from PIL import Image
+
+from humanoid_brain.models.roi import parse_roi
+from humanoid_brain.sdk.inference_api import HumanoidBrain, load_brain
+from humanoid_brain.telemetry.aggregator import WindowedTelemetryLogger
+
+try:
+    import cv2
+except Exception:  # pragma: no cover - optional dependency
+    cv2 = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
+
+WorkItem = Tuple[str, Callable[[], Any]]
+_END = object()
+
+
+def _open_image(path: str) -> Callable[[], Image.Image]:
+    # Opened lazily and left undecoded so preprocess() can use JPEG draft mode (--draft).
+    return lambda: Image.open(path)
+
+
+def _failed(exc: Exception) -> Callable[[], Any]:
+    # Re-raised in the decode pool so the failure is written as an error row.
+    def load() -> Any:
+        raise exc
+
+    return load
+
+
+def _iter_directory(root: str) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            yield os.path.join(dirpath, name)
+
+
+def _iter_manifest(manifest: str, images_root: str) -> Iterator[Tuple[str, Optional[Exception]]]:
+    """Yield `(image_path, None)` per entry, or `(manifest:line, error)` for bad entries."""
+    root = Path(images_root)
+    suffix = Path(manifest).suffix.lower()
+    with open(manifest, "r", encoding="utf-8") as f:
+        if suffix == ".csv":
+            for lineno, item in enumerate(csv.DictReader(f), start=2):
+                if item.get("image"):
+                    yield str(root / item["image"]), None
+                else:
+                    yield f"{manifest}:{lineno}", KeyError("image")
+            return
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            if suffix != ".jsonl":
+                yield str(root / line.strip()), None
+                continue
+            try:
+                yield str(root / json.loads(line)["image"]), None
+            except (ValueError, KeyError, TypeError) as exc:
+                yield f"{manifest}:{lineno}", exc
+
+
+def _iter_video(path: str, stride: int) -> Iterator[WorkItem]:
+    if cv2 is None:
+        raise RuntimeError("OpenCV (cv2) is required for video input.")
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise RuntimeError(f"Cannot open video: {path}")
+    try:
+        frame_idx = 0
+        while True:
+            # grab() skips the colour conversion for frames dropped by the stride.
+            if not capture.grab():
+                break
+            if frame_idx % stride == 0:
+                ok, frame = capture.retrieve()
+                if ok:
+                    # Colour conversion is deferred to the decode pool.
+                    yield f"{path}#frame={frame_idx}", (lambda frame=frame: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            frame_idx += 1
+    finally:
+        capture.release()
+
+
+def iter_work_items(
+    inputs: List[str],
+    manifests: List[str],
+    images_root: str = ".",
+    video_stride: int = 1,
+) -> Iterator[WorkItem]:
+    """Yield `(source_id, loader)` pairs lazily from all configured inputs.
+
+    Failures while enumerating an input are yielded as loaders that raise, so they
+    surface as per-input error rows.
+    """
+
+    def expand(path: str) -> Iterator[WorkItem]:
+        ext = Path(path).suffix.lower()
+        if ext in VIDEO_EXTENSIONS:
+            try:
+                for item in _iter_video(path, video_stride):
+                    yield item
+            except Exception as exc:
+                yield path, _failed(exc)
+        elif ext in IMAGE_EXTENSIONS:
+            yield path, _open_image(path)
+
+    for manifest in manifests:
+        try:
+            for path, error in _iter_manifest(manifest, images_root):
+                if error is not None:
+                    yield path, _failed(error)
+                else:
+                    yield from expand(path)
+        except OSError as exc:
+            yield manifest, _failed(exc)
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for path in _iter_directory(entry):
+                yield from expand(path)
+        else:
+            yield from expand(entry)
+
+
+class ShardWriter:
+    """Writes result rows to numbered JSONL or Parquet shards."""
+
+    def __init__(self, output_dir: str, fmt: str = "jsonl", shard_size: int = 100_000):
+        if fmt not in ("jsonl", "parquet"):
+            raise ValueError("fmt must be 'jsonl' or 'parquet'")
+        if fmt == "parquet" and pa is None:
+            raise RuntimeError("pyarrow is required for Parquet output.")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.shard_index = 0
+        self.rows_in_shard = 0
+        self.total_rows = 0
+        self._jsonl_file = None
+        self._parquet_rows: List[Dict[str, Any]] = []
+
+    def _shard_path(self) -> Path:
+        return self.output_dir / f"part-{self.shard_index:05d}.{self.fmt}"
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.fmt == "jsonl":
+            if self._jsonl_file is None:
+                self._jsonl_file = self._shard_path().open("w", encoding="utf-8")
+            self._jsonl_file.write(json.dumps(row, ensure_ascii=True) + "\n")
+        else:
+            self._parquet_rows.append(row)
+        self.rows_in_shard += 1
+        self.total_rows += 1
+        if self.rows_in_shard >= self.shard_size:
+            self._finish_shard()
+
+    def _finish_shard(self) -> None:
+        if self.rows_in_shard == 0:
+            return
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+            self._jsonl_file = None
+        if self._parquet_rows:
+            pq.write_table(pa.Table.from_pylist(self._parquet_rows), str(self._shard_path()))
+            self._parquet_rows = []
+        self.shard_index += 1
+        self.rows_in_shard = 0
+
+    def close(self) -> None:
+        self._finish_shard()
+
+
+class ThroughputReporter:
+    """Prints periodic frames/s progress to stderr."""
+
+    def __init__(self, interval_s: float = 10.0):
+        self.interval_s = interval_s
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.frames = 0
+        self.errors = 0
+
+    def update(self, frames: int, errors: int = 0) -> None:
+        self.frames += frames
+        self.errors += errors
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval_s:
+            self.last_report = now
+            self.report(final=False)
+
+    def report(self, final: bool) -> Dict[str, float]:
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        stats = {"frames": self.frames, "errors": self.errors, "elapsed_s": elapsed, "frames_per_s": self.frames / elapsed}
+        prefix = "done" if final else "progress"
+        print(
+            f"[bulk] {prefix}: {self.frames} frames, {self.errors} errors, "
+            f"{elapsed:.1f}s, {stats['frames_per_s']:.1f} frames/s",
+            file=sys.stderr,
+        )
+        return stats
+
+
+def _decode(brain: HumanoidBrain, source: str, loader: Callable[[], Any]) -> Tuple[str, Optional[torch.Tensor], Optional[str]]:
+    try:
+        return source, brain.classifier.preprocess(loader()), None
+    except Exception as exc:
+        return source, None, f"{type(exc).__name__}: {exc}"
+
+
+def _produce(
+    items: Iterator[WorkItem],
+    pool: ThreadPoolExecutor,
+    brain: HumanoidBrain,
+    pending: "queue.Queue[Any]",
+    stop: threading.Event,
+) -> None:
+    # Futures are queued in submission order; the bounded queue applies backpressure
+    # so at most `prefetch` decoded frames are alive at once.
+    try:
+        for source, loader in items:
+            if stop.is_set():
+                break
+            pending.put(pool.submit(_decode, brain, source, loader))
+    except Exception as exc:
+        pending.put(exc)
+    finally:
+        pending.put(_END)
+
+
+def _result_row(source: str, decision: Dict[str, Any]) -> Dict[str, Any]:
+    probs = decision["probs"]
+    return {
+        "source": source,
+        "task": decision["task"],
+        "confidence": max(probs.values(), default=0.0),
+        "unknown": decision["unknown"],
+        "probs": probs,
+        "error": None,
+    }
+
+
+def run_bulk_inference(
+    brain: HumanoidBrain,
+    items: Iterator[WorkItem],
+    writer: ShardWriter,
+    batch_size: int = 32,
+    decode_workers: int = 4,
+    prefetch: int = 256,
+    report_interval_s: float = 10.0,
+) -> Dict[str, float]:
+    """Stream work items through decode, batched inference and the shard writer."""
+    reporter = ThroughputReporter(interval_s=report_interval_s)
+    pending: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def flush(sources: List[str], tensors: List[torch.Tensor]) -> None:
+        decisions = brain.decide_batch(torch.stack(tensors))
+        for source, decision in zip(sources, decisions):
+            writer.write(_result_row(source, decision))
+        reporter.update(len(sources))
+
+    with ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="bulk-decode") as pool:
+        producer = threading.Thread(target=_produce, args=(items, pool, brain, pending, stop), daemon=True)
+        producer.start()
+        batch_sources: List[str] = []
+        batch_tensors: List[torch.Tensor] = []
+        try:
+            while True:
+                entry = pending.get()
+                if entry is _END:
+                    break
+                if isinstance(entry, Exception):
+                    raise entry
+                future: Future = entry
+                source, tensor, error = future.result()
+                if tensor is None:
+                    writer.write({"source": source, "task": None, "confidence": None, "unknown": None, "probs": None, "error": error})
+                    reporter.update(0, errors=1)
+                    continue
+                batch_sources.append(source)
+                batch_tensors.append(tensor)
+                if len(batch_tensors) >= batch_size:
+                    flush(batch_sources, batch_tensors)
+                    batch_sources, batch_tensors = [], []
+            if batch_tensors:
+                flush(batch_sources, batch_tensors)
+        finally:
+            stop.set()
+            # Drain so a producer blocked on a full queue can observe `stop` and exit.
+            while producer.is_alive():
+                try:
+                    pending.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            writer.close()
+
+    return reporter.report(final=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run bulk offline chore inference over images and videos.")
+    parser.add_argument("inputs", nargs="*", help="Image/video files or directories to scan recursively.")
+    parser.add_argument("--manifest", action="append", default=[], help="JSONL/CSV with an 'image' field, or a text list.")
+    parser.add_argument("--images-root", type=str, default=".", help="Root for relative manifest paths.")
+    parser.add_argument("--weights", type=str, default="best_licensed_balanced.pt")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--mmap-weights", action="store_true", help="Memory-map weights exported by shared_weights.")
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--roi", type=str, default=None, help="Normalized crop box x0,y0,x1,y1 applied before resize.")
+    parser.add_argument("--draft", action="store_true", help="Decode JPEGs at reduced scale (PIL draft mode).")
+    parser.add_argument("--output-dir", type=str, required=True)
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--decode-workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--prefetch", type=int, default=256, help="Max decoded frames held ahead of inference.")
+    parser.add_argument("--video-stride", type=int, default=1, help="Keep every Nth video frame.")
+    parser.add_argument("--report-interval-s", type=float, default=10.0)
+    parser.add_argument("--telemetry-jsonl", type=str, default=None, help="Write windowed telemetry summaries here.")
+    args = parser.parse_args()
+
+    if not args.inputs and not args.manifest:
+        parser.error("Provide at least one input path or --manifest.")
+    if args.device.startswith("cuda") and not torch.cuda.is_available():
+        raise RuntimeError("CUDA requested but not available.")
+
+    telemetry = None
+    if args.telemetry_jsonl:
+        telemetry = WindowedTelemetryLogger(jsonl_path=args.telemetry_jsonl, to_stdout=False, sample_every_n=0)
+    brain = load_brain(
+        weights_path=args.weights,
+        device=args.device,
+        min_confidence=args.min_confidence,
+        telemetry_logger=telemetry,
+        mmap_weights=args.mmap_weights,
+        roi=parse_roi(args.roi),
+        draft=args.draft,
+    )
+    items = iter_work_items(args.inputs, args.manifest, images_root=args.images_root, video_stride=max(1, args.video_stride))
+    writer = ShardWriter(args.output_dir, fmt=args.format, shard_size=args.shard_size)
+    try:
+        stats = run_bulk_inference(
+            brain,
+            items,
+            writer,
+            batch_size=args.batch_size,
+            decode_workers=args.decode_workers,
+            prefetch=args.prefetch,
+            report_interval_s=args.report_interval_s,
+        )
+    finally:
+        if telemetry:
+            telemetry.close()
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from humanoid_brain.models.roi import ROI, roi_from_state
 from humanoid_brain.models.task_classifier import TaskClassifier
 from humanoid_brain.policies.cleaning_policy import CleaningPolicy
 from humanoid_brain.policies.cooking_policy import CookingPolicy
@@ -12,6 +13,7 @@ from humanoid_brain.policies.laundry_policy import LaundryPolicy
 from humanoid_brain.policies.organizing_policy import OrganizingPolicy
 from humanoid_brain.telemetry.events import ErrorEvent, PolicyPlanEvent
 from humanoid_brain.telemetry.logger import TelemetryLogger
+from humanoid_brain.telemetry.profiler import profile_frame, profile_stage
 
 
 class HumanoidBrain:
@@ -23,6 +25,9 @@ class HumanoidBrain:
         device: str = "cpu",
         min_confidence: float = 0.6,
         telemetry_logger: Optional[TelemetryLogger] = None,
+        mmap_weights: bool = False,
+        roi: Optional[ROI] = None,
+        draft: bool = False,
     ):
         self.telemetry = telemetry_logger
         self.classifier = TaskClassifier(
@@ -30,6 +35,9 @@ class HumanoidBrain:
             device=device,
             min_confidence=min_confidence,
             telemetry_logger=telemetry_logger,
+            mmap_weights=mmap_weights,
+            roi=roi,
+            draft=draft,
         )
         self.policies = {
             "cleaning": CleaningPolicy(),
@@ -43,6 +51,9 @@ class HumanoidBrain:
         """
         Run task prediction and produce symbolic sub-goals.
 
+        An `roi` entry in env_state or robot_state (normalized x0, y0, x1, y1)
+        crops the frame before resizing, overriding the configured ROI.
+
         Returns:
           {
             "task": str,
@@ -52,44 +63,90 @@ class HumanoidBrain:
           }
         """
         try:
-            pred = self.classifier.predict(image)
-            label = pred["label"]
-            probs = pred["probs"]
-
-            if label == "unknown":
-                result = {"task": "unknown", "probs": probs, "sub_goals": [], "unknown": True}
-                if self.telemetry:
-                    self.telemetry.log_event(PolicyPlanEvent(task="unknown", sub_goal_count=0, metadata={"reason": "low_confidence"}))
-                return result
-
-            policy = self.policies.get(label)
-            if policy is None:
-                result = {"task": label, "probs": probs, "sub_goals": [], "unknown": True}
-                if self.telemetry:
-                    self.telemetry.log_event(
-                        ErrorEvent(source="HumanoidBrain.decide", message=f"No policy for label: {label}")
-                    )
-                return result
-
-            observation = {"image": image, "robot_state": robot_state or {}, "env_state": env_state or {}}
-            sub_goals = policy.plan(observation)
+            with profile_frame("decide"):
+                pred = self.classifier.predict(image, roi=roi_from_state(env_state, robot_state))
+                return self._plan(pred, image, robot_state, env_state)
+        except Exception as exc:
             if self.telemetry:
-                self.telemetry.log_event(PolicyPlanEvent(task=label, sub_goal_count=len(sub_goals)))
+                self.telemetry.log_event(
+                    ErrorEvent(source="HumanoidBrain.decide", message=str(exc), details={"type": type(exc).__name__})
+                )
+            raise
+
+    def decide_batch(
+        self,
+        images: Any,
+        robot_state: Optional[Dict[str, Any]] = None,
+        env_state: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched variant of `decide` for offline workloads.
 
-            return {"task": label, "probs": probs, "sub_goals": sub_goals, "unknown": False}
+        `images` is a sequence of images or an NCHW tensor from `classifier.preprocess`.
+        All frames share the same robot/env state. Returns one `decide`-shaped dict per
+        input, in input order.
+        """
+        try:
+            with profile_frame("decide_batch"):
+                preds = self.classifier.predict_batch(images, roi=roi_from_state(env_state, robot_state))
+                return [self._plan(pred, images[idx], robot_state, env_state) for idx, pred in enumerate(preds)]
         except Exception as exc:
             if self.telemetry:
                 self.telemetry.log_event(
-                    ErrorEvent(source="HumanoidBrain.decide", message=str(exc), details={"type": type(exc).__name__})
+                    ErrorEvent(source="HumanoidBrain.decide_batch", message=str(exc), details={"type": type(exc).__name__})
                 )
             raise
 
+    def _plan(
+        self,
+        pred: Dict[str, Any],
+        image: Any,
+        robot_state: Optional[Dict[str, Any]],
+        env_state: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        label = pred["label"]
+        probs = pred["probs"]
+
+        if label == "unknown":
+            result = {"task": "unknown", "probs": probs, "sub_goals": [], "unknown": True}
+            if self.telemetry:
+                self.telemetry.log_event(PolicyPlanEvent(task="unknown", sub_goal_count=0, metadata={"reason": "low_confidence"}))
+            return result
+
+        policy = self.policies.get(label)
+        if policy is None:
+            result = {"task": label, "probs": probs, "sub_goals": [], "unknown": True}
+            if self.telemetry:
+                self.telemetry.log_event(
+                    ErrorEvent(source="HumanoidBrain.decide", message=f"No policy for label: {label}")
+                )
+            return result
+
+        observation = {"image": image, "robot_state": robot_state or {}, "env_state": env_state or {}}
+        with profile_stage("plan"):
+            sub_goals = policy.plan(observation)
+        if self.telemetry:
+            self.telemetry.log_event(PolicyPlanEvent(task=label, sub_goal_count=len(sub_goals)))
+
+        return {"task": label, "probs": probs, "sub_goals": sub_goals, "unknown": False}
+
 
-def load_brain(weights_path: str, device: str = "cpu", min_confidence: float = 0.6, telemetry_logger: Optional[TelemetryLogger] = None) -> HumanoidBrain:
+def load_brain(
+    weights_path: str,
+    device: str = "cpu",
+    min_confidence: float = 0.6,
+    telemetry_logger: Optional[TelemetryLogger] = None,
+    mmap_weights: bool = False,
+    roi: Optional[ROI] = None,
+    draft: bool = False,
+) -> HumanoidBrain:
     """Factory to create HumanoidBrain."""
     return HumanoidBrain(
         weights_path=weights_path,
         device=device,
         min_confidence=min_confidence,
         telemetry_logger=telemetry_logger,
+        mmap_weights=mmap_weights,
+        roi=roi,
+        draft=draft,
     )
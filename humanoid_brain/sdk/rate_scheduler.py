@@ -0,0 +1,122 @@
+"""Adaptive inference-rate scheduler for streaming camera input."""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from humanoid_brain.config import (
+    DEFAULT_INFERENCE_CPU_BUDGET,
+    DEFAULT_MAX_INFERENCE_HZ,
+    DEFAULT_MIN_INFERENCE_HZ,
+    DEFAULT_MIN_CONFIDENCE,
+)
+from humanoid_brain.telemetry.events import InferenceRateEvent
+from humanoid_brain.telemetry.logger import TelemetryLogger
+
+
+class AdaptiveRateScheduler:
+    """
+    Chooses how often to run inference, between `min_hz` and `max_hz`.
+
+    The rate jumps to `max_hz` after a task change or a low-confidence decision and
+    decays towards `min_hz` while decisions stay stable and confident. It is also
+    capped so that inference latency times rate stays within `cpu_budget`, the
+    fraction of wall time the node may spend inferring; `min_hz` always wins over
+    the budget so the robot never stops observing.
+    """
+
+    def __init__(
+        self,
+        min_hz: float = DEFAULT_MIN_INFERENCE_HZ,
+        max_hz: float = DEFAULT_MAX_INFERENCE_HZ,
+        cpu_budget: float = DEFAULT_INFERENCE_CPU_BUDGET,
+        low_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        high_confidence: float = 0.85,
+        stable_decisions: int = 5,
+        decay: float = 0.8,
+        latency_smoothing: float = 0.2,
+        report_interval_s: float = 10.0,
+        telemetry_logger: Optional[TelemetryLogger] = None,
+    ):
+        if not 0 < min_hz <= max_hz:
+            raise ValueError("Require 0 < min_hz <= max_hz")
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1]")
+        self.min_hz = min_hz
+        self.max_hz = max_hz
+        self.cpu_budget = cpu_budget
+        self.low_confidence = low_confidence
+        self.high_confidence = high_confidence
+        self.stable_decisions = stable_decisions
+        self.decay = decay
+        self.latency_smoothing = latency_smoothing
+        self.report_interval_s = report_interval_s
+        self.telemetry = telemetry_logger
+
+        self.rate_hz = max_hz
+        self.latency_s = 0.0
+        self.last_task: Optional[str] = None
+        self._stable_count = 0
+        self._next_run = 0.0
+        self._last_report = 0.0
+        self._last_reported_rate = 0.0
+
+    @property
+    def budget_usage(self) -> float:
+        """Fraction of the CPU budget consumed at the current rate and latency."""
+        return self.latency_s * self.rate_hz / self.cpu_budget
+
+    def should_run(self, now: Optional[float] = None) -> bool:
+        """Return True if a frame arriving at `now` should be inferred."""
+        now = time.monotonic() if now is None else now
+        if now < self._next_run:
+            return False
+        self._next_run = now + 1.0 / self.rate_hz
+        return True
+
+    def update(self, task: str, confidence: float, latency_s: float, now: Optional[float] = None) -> float:
+        """Record one decision and its latency; return the new rate in Hz."""
+        now = time.monotonic() if now is None else now
+        if self.latency_s == 0.0:
+            self.latency_s = latency_s
+        else:
+            self.latency_s += self.latency_smoothing * (latency_s - self.latency_s)
+
+        if task != self.last_task or task == "unknown" or confidence < self.low_confidence:
+            reason = "task_change" if task != self.last_task else "low_confidence"
+            self.rate_hz = self.max_hz
+            self._stable_count = 0
+        else:
+            self._stable_count += 1
+            reason = "stable"
+            if confidence >= self.high_confidence and self._stable_count >= self.stable_decisions:
+                self.rate_hz = max(self.min_hz, self.rate_hz * self.decay)
+        self.last_task = task
+
+        if self.latency_s > 0:
+            budget_hz = self.cpu_budget / self.latency_s
+            if budget_hz < self.rate_hz:
+                self.rate_hz = max(self.min_hz, budget_hz)
+                reason = "cpu_budget"
+
+        # Pull the next slot in when the rate rises so a burst starts immediately.
+        self._next_run = min(self._next_run, now + 1.0 / self.rate_hz)
+        self._report(reason, now)
+        return self.rate_hz
+
+    def _report(self, reason: str, now: float) -> None:
+        if not self.telemetry:
+            return
+        changed = abs(self.rate_hz - self._last_reported_rate) >= 0.1 * max(self._last_reported_rate, 1e-9)
+        if changed or now - self._last_report >= self.report_interval_s:
+            self._last_report = now
+            self._last_reported_rate = self.rate_hz
+            self.telemetry.log_event(
+                InferenceRateEvent(
+                    rate_hz=self.rate_hz,
+                    budget_usage=self.budget_usage,
+                    latency_ms=self.latency_s * 1000.0,
+                    reason=reason,
+                )
+            )
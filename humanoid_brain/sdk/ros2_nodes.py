@@ -9,15 +9,22 @@ This module is ROS2-optional. Importing works without ROS2 installed; running no
 
 from __future__ import annotations
 
+import argparse
 import json
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from humanoid_brain.config import DEFAULT_INFERENCE_CPU_BUDGET, DEFAULT_MAX_INFERENCE_HZ, DEFAULT_MIN_INFERENCE_HZ
+from humanoid_brain.models.roi import ROI, parse_roi
 from humanoid_brain.sdk.inference_api import HumanoidBrain
+from humanoid_brain.sdk.rate_scheduler import AdaptiveRateScheduler
 from humanoid_brain.telemetry.events import ErrorEvent
+from humanoid_brain.telemetry.aggregator import WindowedTelemetryLogger
 from humanoid_brain.telemetry.logger import TelemetryLogger
+from humanoid_brain.telemetry.profiler import InferenceProfiler
 
 try:
     import rclpy
@@ -61,7 +68,13 @@ class SubGoalArray:
 
 
 class TaskBrainNode(Node):  # type: ignore[misc]
-    """ROS2 node that consumes camera frames and publishes task decisions."""
+    """ROS2 node that consumes camera frames and publishes task decisions.
+
+    `weights_path`, `device`, `adaptive_rate`, `min_rate_hz`, `max_rate_hz`,
+    `cpu_budget` and `roi` ("x0,y0,x1,y1", empty for none) are declared as ROS
+    parameters; constructor arguments are their defaults, so launch-file values
+    take precedence. An `roi` in the robot state overrides the fixed one per frame.
+    """
 
     def __init__(
         self,
@@ -72,11 +85,43 @@ class TaskBrainNode(Node):  # type: ignore[misc]
         decision_topic: str = "/task_brain/decision",
         sub_goals_topic: str = "/task_brain/sub_goals",
         telemetry_logger: Optional[TelemetryLogger] = None,
+        mmap_weights: bool = False,
+        adaptive_rate: bool = True,
+        min_rate_hz: float = DEFAULT_MIN_INFERENCE_HZ,
+        max_rate_hz: float = DEFAULT_MAX_INFERENCE_HZ,
+        cpu_budget: float = DEFAULT_INFERENCE_CPU_BUDGET,
+        profile_dir: Optional[str] = None,
+        profile_frames: int = 50,
+        roi: Optional[ROI] = None,
     ):
         super().__init__("task_brain_node")
+        weights_path = self.declare_parameter("weights_path", weights_path).value
+        device = self.declare_parameter("device", device).value
+        adaptive_rate = self.declare_parameter("adaptive_rate", adaptive_rate).value
+        min_rate_hz = float(self.declare_parameter("min_rate_hz", float(min_rate_hz)).value)
+        max_rate_hz = float(self.declare_parameter("max_rate_hz", float(max_rate_hz)).value)
+        cpu_budget = float(self.declare_parameter("cpu_budget", float(cpu_budget)).value)
+        default_roi = ",".join(str(v) for v in parse_roi(roi)) if roi is not None else ""
+        roi = parse_roi(self.declare_parameter("roi", default_roi).value or None)
         self.telemetry = telemetry_logger
-        self.brain = HumanoidBrain(weights_path=weights_path, device=device, telemetry_logger=telemetry_logger)
+        self.brain = HumanoidBrain(
+            weights_path=weights_path,
+            device=device,
+            telemetry_logger=telemetry_logger,
+            mmap_weights=mmap_weights,
+            roi=roi,
+        )
+        self.scheduler: Optional[AdaptiveRateScheduler] = None
+        if adaptive_rate:
+            self.scheduler = AdaptiveRateScheduler(
+                min_hz=min_rate_hz,
+                max_hz=max_rate_hz,
+                cpu_budget=cpu_budget,
+                telemetry_logger=telemetry_logger,
+            )
         self.bridge = CvBridge() if CvBridge else None
+        # Stops and exports itself once profile_frames decisions have been traced.
+        self.profiler = InferenceProfiler(profile_dir, max_frames=profile_frames).start() if profile_dir else None
         self.latest_robot_state: Dict[str, Any] = {}
 
         self.image_sub = self.create_subscription(Image, image_topic, self._on_image, 10)
@@ -99,12 +144,18 @@ class TaskBrainNode(Node):  # type: ignore[misc]
         return np.asarray(cv_img, dtype=np.uint8)
 
     def _on_image(self, msg: Image) -> None:
+        # Skip frames before any conversion work when the scheduler says we are ahead.
+        if self.scheduler and not self.scheduler.should_run():
+            return
         try:
+            start = time.perf_counter()
             image_np = self._image_to_np(msg)
             result = self.brain.decide(image_np, robot_state=self.latest_robot_state, env_state={})
             probs = result["probs"]
             task = result["task"]
             confidence = probs.get(task, 0.0) if task != "unknown" else max(probs.values(), default=0.0)
+            if self.scheduler:
+                self.scheduler.update(task, confidence, time.perf_counter() - start)
 
             decision_payload = {
                 "task": task,
@@ -134,13 +185,48 @@ def main() -> None:
     if rclpy is None:
         raise RuntimeError("ROS2 dependencies not available. Install rclpy + sensor_msgs + std_msgs + cv_bridge.")
 
-    rclpy.init()
-    node = TaskBrainNode(weights_path="best_licensed_balanced.pt")
+    parser = argparse.ArgumentParser(description="Run the task brain ROS2 node.")
+    parser.add_argument("--weights", type=str, default="best_licensed_balanced.pt")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--mmap-weights", action="store_true", help="Memory-map weights exported by shared_weights.")
+    parser.add_argument("--roi", type=str, default=None, help="Normalized crop box x0,y0,x1,y1 applied before resize.")
+    parser.add_argument("--profile-dir", type=str, default=None, help="Write a torch.profiler trace of the first frames here.")
+    parser.add_argument("--profile-frames", type=int, default=50)
+    parser.add_argument("--telemetry-jsonl", type=str, default=None)
+    parser.add_argument(
+        "--telemetry-window-s", type=float, default=60.0, help="Telemetry summary window; 0 logs every raw event."
+    )
+    parser.add_argument("--telemetry-sample-every", type=int, default=100, help="Keep 1 in N raw events when aggregating.")
+    args, ros_args = parser.parse_known_args()
+
+    if args.telemetry_window_s:
+        telemetry: TelemetryLogger = WindowedTelemetryLogger(
+            jsonl_path=args.telemetry_jsonl,
+            to_stdout=True,
+            window_s=args.telemetry_window_s,
+            sample_every_n=args.telemetry_sample_every,
+        )
+    else:
+        telemetry = TelemetryLogger(jsonl_path=args.telemetry_jsonl, to_stdout=True)
+
+    rclpy.init(args=ros_args)
+    node = TaskBrainNode(
+        weights_path=args.weights,
+        device=args.device,
+        telemetry_logger=telemetry,
+        mmap_weights=args.mmap_weights,
+        profile_dir=args.profile_dir,
+        profile_frames=args.profile_frames,
+        roi=parse_roi(args.roi),
+    )
     try:
         rclpy.spin(node)
     finally:
+        if node.profiler:
+            node.profiler.stop()
         node.destroy_node()
         rclpy.shutdown()
+        telemetry.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""Windowed telemetry aggregation with raw-event sampling."""
+
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Tuple
+
+from .events import BaseEvent, ErrorEvent, InferenceRateEvent, PolicyPlanEvent, TaskDecisionEvent, WindowSummaryEvent
+from .logger import TelemetryLogger
+
+# Bounds the decision verdicts awaiting a plan when a classifier is used without a
+# planner; far above any batch size.
+_MAX_PENDING_PLANS = 4096
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+class WindowedTelemetryLogger(TelemetryLogger):
+    """
+    Drop-in TelemetryLogger that aggregates events over fixed time windows.
+
+    Per-label counts, a confidence histogram, the unknown rate, plan counts, error
+    counts and the last/mean inference rate and budget usage are accumulated in
+    memory and emitted as one WindowSummaryEvent per window. Raw events are passed
+    through at 1 in `sample_every_n`; errors and unknown decisions are always kept
+    unless disabled, and inference-rate events (already rate-limited at the
+    scheduler) are always kept.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        to_stdout: bool = True,
+        window_s: float = 60.0,
+        sample_every_n: int = 100,
+        keep_errors: bool = True,
+        keep_unknown: bool = True,
+        histogram_bins: int = 10,
+    ):
+        if window_s <= 0:
+            raise ValueError("window_s must be positive")
+        if sample_every_n < 0:
+            raise ValueError("sample_every_n must be >= 0 (0 disables raw events)")
+        if histogram_bins < 1:
+            raise ValueError("histogram_bins must be >= 1")
+        super().__init__(jsonl_path=jsonl_path, to_stdout=to_stdout)
+        self.window_s = window_s
+        self.sample_every_n = sample_every_n
+        self.keep_errors = keep_errors
+        self.keep_unknown = keep_unknown
+        self.histogram_bins = histogram_bins
+
+        self._lock = threading.Lock()
+        self._seen: Counter = Counter()
+        self._plan_verdicts: Deque[Tuple[str, bool]] = deque(maxlen=_MAX_PENDING_PLANS)
+        self._window_start: Optional[float] = None
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._decision_count = 0
+        self._label_counts: Counter = Counter()
+        self._histogram: List[int] = [0] * self.histogram_bins
+        self._plan_counts: Counter = Counter()
+        self._error_counts: Counter = Counter()
+        self._sampled = 0
+        self._dropped = 0
+        self._rate_events = 0
+        self._rate_sum = 0.0
+        self._budget_sum = 0.0
+        self._last_rate: Optional[float] = None
+        self._last_budget: Optional[float] = None
+
+    def _window_floor(self, now: float) -> float:
+        # Align windows to wall-clock multiples so summaries line up across robots.
+        return now - (now % self.window_s)
+
+    def _accumulate(self, event: BaseEvent) -> bool:
+        """Update window aggregates and return True if the event must be kept.
+
+        Sampling is decided once per frame at its TaskDecisionEvent and queued; each
+        PolicyPlanEvent takes the oldest queued decision with its label, so kept
+        decisions and plans stay paired even when a batch logs all decisions before
+        its plans. Decisions that never got a plan (no policy for the label) are
+        skipped. Other event types are sampled with their own counters.
+        """
+        if isinstance(event, TaskDecisionEvent):
+            self._decision_count += 1
+            self._label_counts[event.label] += 1
+            confidence = min(max(event.confidence, 0.0), 1.0)
+            bucket = min(int(confidence * self.histogram_bins), self.histogram_bins - 1)
+            self._histogram[bucket] += 1
+            sampled = self._should_sample(event.event_type)
+            keep = sampled or (self.keep_unknown and event.label == "unknown")
+            self._plan_verdicts.append((event.label, keep))
+            return keep
+        if isinstance(event, PolicyPlanEvent):
+            self._plan_counts[event.task] += 1
+            while self._plan_verdicts:
+                label, keep = self._plan_verdicts.popleft()
+                if label == event.task:
+                    return keep
+            return False
+        if isinstance(event, ErrorEvent):
+            self._error_counts[event.source] += 1
+            return self.keep_errors or self._should_sample(event.event_type)
+        if isinstance(event, InferenceRateEvent):
+            self._rate_events += 1
+            self._rate_sum += event.rate_hz
+            self._budget_sum += event.budget_usage
+            self._last_rate = event.rate_hz
+            self._last_budget = event.budget_usage
+            return True
+        return self._should_sample(event.event_type)
+
+    def _should_sample(self, event_type: str) -> bool:
+        if self.sample_every_n == 0:
+            return False
+        self._seen[event_type] += 1
+        return (self._seen[event_type] - 1) % self.sample_every_n == 0
+
+    def _flush_locked(self, window_end: float, timestamp: Optional[str] = None) -> None:
+        if self._window_start is None:
+            return
+        has_data = self._decision_count or self._plan_counts or self._error_counts or self._rate_events
+        if has_data:
+            unknown_rate = self._label_counts.get("unknown", 0) / self._decision_count if self._decision_count else 0.0
+            summary = WindowSummaryEvent(
+                window_start=_iso(self._window_start),
+                window_end=_iso(window_end),
+                decision_count=self._decision_count,
+                label_counts=dict(self._label_counts),
+                unknown_rate=unknown_rate,
+                confidence_histogram=list(self._histogram),
+                plan_counts=dict(self._plan_counts),
+                error_counts=dict(self._error_counts),
+                sampled_event_count=self._sampled,
+                dropped_event_count=self._dropped,
+                inference_rate_hz=self._last_rate,
+                mean_inference_rate_hz=self._rate_sum / self._rate_events if self._rate_events else None,
+                budget_usage=self._last_budget,
+                mean_budget_usage=self._budget_sum / self._rate_events if self._rate_events else None,
+            )
+            if timestamp is not None:
+                # Stamp no later than the event that closed the window, so the log
+                # stays in timestamp order for the reader's binary search.
+                summary.timestamp = timestamp
+            super().log_event(summary)
+        self._reset_window()
+
+    def log_event(self, event: BaseEvent) -> None:
+        """Aggregate one event and forward it if it is kept by sampling."""
+        now = time.time()
+        with self._lock:
+            if self._window_start is None:
+                self._window_start = self._window_floor(now)
+            elif now >= self._window_start + self.window_s:
+                self._flush_locked(self._window_start + self.window_s, event.timestamp)
+                self._window_start = self._window_floor(now)
+
+            keep = self._accumulate(event)
+            if keep:
+                self._sampled += 1
+                super().log_event(event)
+            else:
+                self._dropped += 1
+
+    def flush(self) -> None:
+        """Emit the summary for the current partial window immediately."""
+        with self._lock:
+            self._flush_locked(time.time())
+            self._window_start = None
+
+    def close(self) -> None:
+        """Flush the pending window, then close the underlying file handle."""
+        if getattr(self, "_lock", None) is not None and self._window_start is not None:
+            self.flush()
+        super().close()
@@ -2,7 +2,7 @@
 
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 def _utc_now_iso() -> str:
@@ -63,3 +63,73 @@ class ErrorEvent(BaseEvent):
         self.source = source
         self.message = message
         self.details = details
+
+
+@dataclass
+class WindowSummaryEvent(BaseEvent):
+    """Event summarizing aggregated telemetry over one fixed time window."""
+
+    window_start: str = ""
+    window_end: str = ""
+    decision_count: int = 0
+    label_counts: Dict[str, int] = field(default_factory=dict)
+    unknown_rate: float = 0.0
+    confidence_histogram: List[int] = field(default_factory=list)
+    plan_counts: Dict[str, int] = field(default_factory=dict)
+    error_counts: Dict[str, int] = field(default_factory=dict)
+    sampled_event_count: int = 0
+    dropped_event_count: int = 0
+    inference_rate_hz: Optional[float] = None
+    mean_inference_rate_hz: Optional[float] = None
+    budget_usage: Optional[float] = None
+    mean_budget_usage: Optional[float] = None
+
+    def __init__(
+        self,
+        window_start: str,
+        window_end: str,
+        decision_count: int,
+        label_counts: Dict[str, int],
+        unknown_rate: float,
+        confidence_histogram: List[int],
+        plan_counts: Dict[str, int],
+        error_counts: Dict[str, int],
+        sampled_event_count: int,
+        dropped_event_count: int,
+        inference_rate_hz: Optional[float] = None,
+        mean_inference_rate_hz: Optional[float] = None,
+        budget_usage: Optional[float] = None,
+        mean_budget_usage: Optional[float] = None,
+    ):
+        super().__init__(event_type="window_summary")
+        self.window_start = window_start
+        self.window_end = window_end
+        self.decision_count = decision_count
+        self.label_counts = label_counts
+        self.unknown_rate = unknown_rate
+        self.confidence_histogram = confidence_histogram
+        self.plan_counts = plan_counts
+        self.error_counts = error_counts
+        self.sampled_event_count = sampled_event_count
+        self.dropped_event_count = dropped_event_count
+        self.inference_rate_hz = inference_rate_hz
+        self.mean_inference_rate_hz = mean_inference_rate_hz
+        self.budget_usage = budget_usage
+        self.mean_budget_usage = mean_budget_usage
+
+
+@dataclass
+class InferenceRateEvent(BaseEvent):
+    """Event for adaptive inference-rate scheduler state."""
+
+    rate_hz: float = 0.0
+    budget_usage: float = 0.0
+    latency_ms: float = 0.0
+    reason: str = ""
+
+    def __init__(self, rate_hz: float, budget_usage: float, latency_ms: float, reason: str):
+        super().__init__(event_type="inference_rate")
+        self.rate_hz = rate_hz
+        self.budget_usage = budget_usage
+        self.latency_ms = latency_ms
+        self.reason = reason
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Optional
 
 from .events import BaseEvent
+from .profiler import profile_stage
 
 
 class TelemetryLogger:
@@ -22,13 +23,14 @@ class TelemetryLogger:
 
     def log_event(self, event: BaseEvent) -> None:
         """Persist one event."""
-        payload = event.to_dict()
-        line = json.dumps(payload, ensure_ascii=True)
-        if self.to_stdout:
-            print(line)
-        if self._jsonl_file:
-            self._jsonl_file.write(line + "\n")
-            self._jsonl_file.flush()
+        with profile_stage("telemetry"):
+            payload = event.to_dict()
+            line = json.dumps(payload, ensure_ascii=True)
+            if self.to_stdout:
+                print(line)
+            if self._jsonl_file:
+                self._jsonl_file.write(line + "\n")
+                self._jsonl_file.flush()
 
     def close(self) -> None:
         """Close underlying file handle."""
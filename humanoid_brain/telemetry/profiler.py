@@ -0,0 +1,119 @@
+"""On-demand operator-level profiling of inference with torch.profiler.
+
+Inference code marks its stages with `profile_stage(...)` and whole frames with
+`profile_frame(...)`. Both are no-ops unless an `InferenceProfiler` is active, in
+which case they become `torch.profiler.record_function` ranges so traces show the
+preprocess / forward / plan / telemetry stages around the model operators.
+
+    with profile_inference("profiles/", max_frames=50):
+        for frame in frames:
+            brain.decide(frame)
+
+Writes `trace.json` (open in chrome://tracing or Perfetto) and `operators.txt`.
+torch is only imported once a profiler is created, so telemetry-only processes
+that import this module (via TelemetryLogger) do not load it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional
+
+_NULL_CONTEXT = contextlib.nullcontext()
+_active: Optional["InferenceProfiler"] = None
+
+
+class InferenceProfiler:
+    """Records a bounded number of inference frames and exports the trace."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        max_frames: int = 50,
+        record_shapes: bool = True,
+        with_stack: bool = False,
+        row_limit: int = 50,
+    ):
+        if max_frames < 1:
+            raise ValueError("max_frames must be >= 1")
+        import torch
+        from torch.profiler import ProfilerActivity, profile, record_function
+
+        self._record_function = record_function
+        self.output_dir = Path(output_dir)
+        self.max_frames = max_frames
+        self.row_limit = row_limit
+        self.frames = 0
+        self._depth = threading.local()
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        self._profile = profile(activities=activities, record_shapes=record_shapes, with_stack=with_stack)
+        self._running = False
+
+    def start(self) -> "InferenceProfiler":
+        """Start recording; only one profiler may be active per process."""
+        global _active
+        if _active is not None:
+            raise RuntimeError("An InferenceProfiler is already active.")
+        self._profile.start()
+        self._running = True
+        _active = self
+        return self
+
+    def stop(self) -> None:
+        """Stop recording and export the trace and operator summary."""
+        global _active
+        if not self._running:
+            return
+        self._running = False
+        _active = None
+        self._profile.stop()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._profile.export_chrome_trace(str(self.output_dir / "trace.json"))
+        table = self._profile.key_averages().table(sort_by="self_cpu_time_total", row_limit=self.row_limit)
+        (self.output_dir / "operators.txt").write_text(f"frames profiled: {self.frames}\n{table}\n", encoding="utf-8")
+
+    @contextlib.contextmanager
+    def frame(self, name: str) -> Iterator[None]:
+        # Only the outermost frame counts, so decide() -> predict() is one frame.
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        try:
+            with self._record_function(f"humanoid_brain.{name}"):
+                yield
+        finally:
+            self._depth.value = depth
+            if depth == 0:
+                self.frames += 1
+                if self.frames >= self.max_frames:
+                    self.stop()
+
+
+def profile_stage(name: str) -> ContextManager[object]:
+    """Label a stage of inference in the active trace; no-op when not profiling."""
+    profiler = _active
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler._record_function(f"humanoid_brain.{name}")
+
+
+def profile_frame(name: str) -> ContextManager[None]:
+    """Mark one inference frame; the active profiler stops after `max_frames`."""
+    profiler = _active
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.frame(name)
+
+
+@contextlib.contextmanager
+def profile_inference(output_dir: str, max_frames: int = 50, record_shapes: bool = True, with_stack: bool = False) -> Iterator[InferenceProfiler]:
+    """Profile up to `max_frames` inference frames run inside the block."""
+    profiler = InferenceProfiler(output_dir, max_frames=max_frames, record_shapes=record_shapes, with_stack=with_stack)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
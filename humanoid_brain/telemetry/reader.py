@@ -0,0 +1,351 @@
+"""Indexed reader and query CLI for TelemetryLogger JSONL files.
+
+A sidecar index (`<log>.idx` + `<log>.idx.json`) stores one fixed-size record per
+event: timestamp, byte offset, event_type code and label code. The index is
+extended incrementally from the last indexed byte, memory-mapped for queries, and
+binary-searched by timestamp, so time-range and label queries touch only the
+matching lines of the log. Timestamps may step backwards by a bounded amount
+(e.g. a summary stamped after the event that triggered it); the index records the
+largest such skew and widens the binary-search bounds by it. Counting queries parse at most the window_summary lines
+written by WindowedTelemetryLogger, whose exact counts replace the sampled raw
+events for the windows they cover. The meta file stores a fingerprint (inode and
+hash of the first line) so a rotated or rewritten log triggers a rebuild.
+
+    python -m humanoid_brain.telemetry.reader counts robot.jsonl --window-s 60
+    python -m humanoid_brain.telemetry.reader events robot.jsonl --label unknown \\
+        --start 2026-10-19T14:00:00 --end 2026-10-19T14:05:00
+    python -m humanoid_brain.telemetry.reader errors robot.jsonl --start 2026-10-19T14:00:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+INDEX_DTYPE = np.dtype([("ts", "<f8"), ("offset", "<u8"), ("event_type", "<u2"), ("label", "<u2")])
+_INDEX_VERSION = 3
+
+# Field that carries the "label" of each event type in the index.
+_LABEL_FIELDS = {"task_decision": "label", "policy_plan": "task", "error": "source"}
+# window_summary field holding exact per-window counts for each event type.
+_SUMMARY_COUNT_FIELDS = {"task_decision": "label_counts", "policy_plan": "plan_counts", "error": "error_counts"}
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse an ISO-8601 timestamp to epoch seconds; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _format_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+class TelemetryIndex:
+    """Sidecar byte-offset index over one telemetry JSONL file."""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.index_path = log_path + ".idx"
+        self.meta_path = log_path + ".idx.json"
+        self.event_types: List[str] = [""]
+        self.labels: List[str] = [""]
+        self.indexed_bytes = 0
+        self.record_count = 0
+        self.last_ts = float("-inf")
+        self.max_skew = 0.0
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        self._load_meta()
+
+    def _load_meta(self) -> None:
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.index_path)):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != _INDEX_VERSION:
+            return
+        self.event_types = meta["event_types"]
+        self.labels = meta["labels"]
+        self.indexed_bytes = meta["indexed_bytes"]
+        self.record_count = meta["record_count"]
+        self.last_ts = meta["last_ts"]
+        self.max_skew = meta["max_skew"]
+        self.fingerprint = meta["fingerprint"]
+
+    def _current_fingerprint(self) -> Optional[Dict[str, Any]]:
+        with open(self.log_path, "rb") as f:
+            first_line = f.readline()
+            inode = os.fstat(f.fileno()).st_ino
+        if not first_line.endswith(b"\n"):
+            return None
+        return {"inode": inode, "head": hashlib.sha1(first_line).hexdigest()}
+
+    def _save_meta(self) -> None:
+        meta = {
+            "version": _INDEX_VERSION,
+            "event_types": self.event_types,
+            "labels": self.labels,
+            "indexed_bytes": self.indexed_bytes,
+            "record_count": self.record_count,
+            "last_ts": self.last_ts,
+            "max_skew": self.max_skew,
+            "fingerprint": self.fingerprint,
+        }
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _reset(self) -> None:
+        self.event_types = [""]
+        self.labels = [""]
+        self.indexed_bytes = 0
+        self.record_count = 0
+        self.last_ts = float("-inf")
+        self.max_skew = 0.0
+        self.fingerprint = None
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+    @staticmethod
+    def _code(vocab: List[str], lookup: Dict[str, int], value: str) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = len(vocab)
+            vocab.append(value)
+            lookup[value] = code
+        return code
+
+    def update(self, chunk_records: int = 65536) -> int:
+        """Index lines appended since the last update; return the number added."""
+        log_size = os.path.getsize(self.log_path)
+        fingerprint = self._current_fingerprint()
+        if log_size < self.indexed_bytes or (self.indexed_bytes and fingerprint != self.fingerprint):
+            # The log was truncated, rewritten or rotated under the same name.
+            self._reset()
+        self.fingerprint = fingerprint
+        if log_size == self.indexed_bytes:
+            return 0
+
+        type_lookup = {value: idx for idx, value in enumerate(self.event_types)}
+        label_lookup = {value: idx for idx, value in enumerate(self.labels)}
+        added = 0
+        records = np.empty(chunk_records, dtype=INDEX_DTYPE)
+        count = 0
+        with open(self.log_path, "rb") as log, open(self.index_path, "ab") as index:
+            # Drop records written after the last saved metadata (interrupted update).
+            index.truncate(self.record_count * INDEX_DTYPE.itemsize)
+            log.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            for raw in log:
+                if not raw.endswith(b"\n"):
+                    # Partial line still being written; pick it up next time.
+                    break
+                line_offset = offset
+                offset += len(raw)
+                try:
+                    event = json.loads(raw)
+                    ts = parse_timestamp(event["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                event_type = event.get("event_type", "")
+                label = event.get(_LABEL_FIELDS.get(event_type, ""), "") or ""
+                if ts < self.last_ts:
+                    self.max_skew = max(self.max_skew, self.last_ts - ts)
+                self.last_ts = max(self.last_ts, ts)
+                records[count] = (
+                    ts,
+                    line_offset,
+                    self._code(self.event_types, type_lookup, event_type),
+                    self._code(self.labels, label_lookup, str(label)),
+                )
+                count += 1
+                if count == chunk_records:
+                    index.write(records.tobytes())
+                    added += count
+                    count = 0
+            if count:
+                index.write(records[:count].tobytes())
+                added += count
+            self.indexed_bytes = offset
+            self.record_count += added
+        self._save_meta()
+        return added
+
+    def records(self) -> np.ndarray:
+        """Return the index as a read-only memory-mapped record array."""
+        if self.record_count == 0 or not os.path.exists(self.index_path):
+            return np.empty(0, dtype=INDEX_DTYPE)
+        return np.memmap(self.index_path, dtype=INDEX_DTYPE, mode="r", shape=(self.record_count,))
+
+    def select(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        event_type: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> np.ndarray:
+        """Return index records in `[start, end)` matching the type and label filters."""
+        records = self.records()
+        # Every record lies within max_skew below the running maximum timestamp, so
+        # a binary search for start - skew / end + skew cannot cut off a match; the
+        # exact mask then trims the few out-of-order records at the edges.
+        lo = 0 if start is None else int(np.searchsorted(records["ts"], start - self.max_skew, side="left"))
+        hi = len(records) if end is None else int(np.searchsorted(records["ts"], end + self.max_skew, side="left"))
+        selected = records[lo:hi]
+        if self.max_skew and len(selected):
+            mask = np.ones(len(selected), dtype=bool)
+            if start is not None:
+                mask &= selected["ts"] >= start
+            if end is not None:
+                mask &= selected["ts"] < end
+            selected = selected[mask]
+
+        if event_type is not None:
+            if event_type not in self.event_types:
+                return selected[:0]
+            selected = selected[selected["event_type"] == self.event_types.index(event_type)]
+        if label is not None:
+            if label not in self.labels:
+                return selected[:0]
+            selected = selected[selected["label"] == self.labels.index(label)]
+        return selected
+
+
+class TelemetryReader:
+    """Filtered, time-ranged iteration over an indexed telemetry log."""
+
+    def __init__(self, log_path: str, update_index: bool = True):
+        self.log_path = log_path
+        self.index = TelemetryIndex(log_path)
+        if update_index:
+            self.index.update()
+
+    def iter_events(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        event_type: Optional[str] = None,
+        label: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield decoded events matching the filters, in log order."""
+        selected = self.index.select(start=start, end=end, event_type=event_type, label=label)
+        if limit is not None:
+            selected = selected[:limit]
+        if len(selected) == 0:
+            return
+        with open(self.log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in selected["offset"]:
+                offset = int(offset)
+                end_of_line = data.find(b"\n", offset)
+                yield json.loads(data[offset:end_of_line])
+
+    def label_counts(
+        self,
+        window_s: float,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        event_type: str = "task_decision",
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """Count labels per fixed window.
+
+        Raw events are counted from the index. Where the log contains window_summary
+        events, their exact counts are used instead and raw events inside the
+        summarized windows (which were sampled) are skipped. Each summary is
+        attributed to the query window containing its window_start.
+        """
+        counts: Dict[int, Counter] = {}
+        covered: List[Tuple[float, float]] = []
+        summary_field = _SUMMARY_COUNT_FIELDS.get(event_type)
+        if summary_field is not None:
+            for summary in self.iter_events(event_type="window_summary"):
+                window_start = parse_timestamp(summary["window_start"])
+                window_end = parse_timestamp(summary["window_end"])
+                covered.append((window_start, window_end))
+                if (start is not None and window_start < start) or (end is not None and window_start >= end):
+                    continue
+                bucket = int(np.floor(window_start / window_s))
+                counts.setdefault(bucket, Counter()).update(summary.get(summary_field) or {})
+
+        selected = self.index.select(start=start, end=end, event_type=event_type)
+        if covered and len(selected):
+            covered.sort()
+            starts = np.array([c[0] for c in covered])
+            ends = np.maximum.accumulate(np.array([c[1] for c in covered]))
+            pos = np.searchsorted(starts, selected["ts"], side="right") - 1
+            inside = (pos >= 0) & (selected["ts"] < ends[np.clip(pos, 0, None)])
+            selected = selected[~inside]
+        if len(selected):
+            buckets = np.floor(selected["ts"] / window_s).astype(np.int64)
+            for (bucket, label_code), count in Counter(zip(buckets.tolist(), selected["label"].tolist())).items():
+                counts.setdefault(bucket, Counter())[self.index.labels[label_code]] += count
+        return [
+            (_format_timestamp(bucket * window_s), dict(sorted(counts[bucket].items())))
+            for bucket in sorted(counts)
+            if counts[bucket]
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query indexed telemetry JSONL logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(cmd: argparse.ArgumentParser) -> None:
+        cmd.add_argument("log", type=str)
+        cmd.add_argument("--start", type=str, default=None, help="ISO-8601 start (inclusive, UTC if naive).")
+        cmd.add_argument("--end", type=str, default=None, help="ISO-8601 end (exclusive, UTC if naive).")
+
+    index_cmd = sub.add_parser("index", help="Build or extend the sidecar index.")
+    index_cmd.add_argument("log", type=str)
+
+    events_cmd = sub.add_parser("events", help="Print matching events as JSONL.")
+    add_common(events_cmd)
+    events_cmd.add_argument("--type", dest="event_type", type=str, default=None)
+    events_cmd.add_argument("--label", type=str, default=None)
+    events_cmd.add_argument("--limit", type=int, default=None)
+
+    counts_cmd = sub.add_parser("counts", help="Label counts per time window.")
+    add_common(counts_cmd)
+    counts_cmd.add_argument("--window-s", type=float, default=60.0)
+    counts_cmd.add_argument("--type", dest="event_type", type=str, default="task_decision")
+
+    errors_cmd = sub.add_parser("errors", help="List error events.")
+    add_common(errors_cmd)
+    errors_cmd.add_argument("--limit", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "index":
+        index = TelemetryIndex(args.log)
+        added = index.update()
+        print(f"Indexed {added} new events ({len(index.records())} total).")
+        return
+
+    reader = TelemetryReader(args.log)
+    start = parse_timestamp(args.start) if args.start else None
+    end = parse_timestamp(args.end) if args.end else None
+
+    if args.command == "events":
+        for event in reader.iter_events(start=start, end=end, event_type=args.event_type, label=args.label, limit=args.limit):
+            print(json.dumps(event, ensure_ascii=True))
+    elif args.command == "counts":
+        for window_start, counts in reader.label_counts(args.window_s, start=start, end=end, event_type=args.event_type):
+            print(json.dumps({"window_start": window_start, "counts": counts}))
+    else:
+        for event in reader.iter_events(start=start, end=end, event_type="error", limit=args.limit):
+            print(f"{event['timestamp']}  {event.get('source')}: {event.get('message')}")
+
+
+if __name__ == "__main__":
+    main()